@@ -1,37 +1,114 @@
+import asyncio
 import os
 import pickle
 import time
 from datetime import datetime, timedelta
+from functools import lru_cache
 
+import httpx
 import pandas as pd
 from pycoingecko import CoinGeckoAPI
-from tradingview_ta import get_multiple_analysis
 
 cg = CoinGeckoAPI()
 
+# TradingView scanner endpoint, the same one used by tradingview_ta
+SCAN_URL = "https://scanner.tradingview.com/crypto/scan"
+# Suffix of the indicator column for each time frame, the daily one has none
+INTERVAL_SUFFIXES = {
+    "1m": "|1",
+    "5m": "|5",
+    "15m": "|15",
+    "30m": "|30",
+    "1h": "|60",
+    "2h": "|120",
+    "4h": "|240",
+    "1d": "",
+    "1W": "|1W",
+    "1M": "|1M",
+}
+# Symbols per TradingView request, all batches are requested concurrently
+BATCH_SIZE = 25
+
+# Seconds that fetched results are reused in memory, the APIs cache ~20s themselves
+RSI_CACHE_SECONDS = 20
+TOP_VOL_CACHE_SECONDS = 60
+
+# Symbols to exclude from the top volume coins
+_STABLE_COINS = frozenset(
+    [
+        "OKBUSDT",
+        "DAIUSDT",
+        "USDTUSDT",
+        "USDCUSDT",
+        "BUSDUSDT",
+        "TUSDUSDT",
+        "PAXUSDT",
+        "EURUSDT",
+        "GBPUSDT",
+        "CETHUSDT",
+        "WBTCUSDT",
+    ]
+)
+
+# (exchange, time frame, coins) -> (time bucket, RSI dict)
+_rsi_cache = {}
+
 
 def get_RSI(coins: list, exchange: str = "BINANCE", time_frame: str = "1d") -> dict:
+    # Reuse the RSI values if they were fetched within the current time bucket
+    cache_key = (exchange.upper(), time_frame, tuple(coins))
+    time_bucket = int(time.time() // RSI_CACHE_SECONDS)
+    cached = _rsi_cache.get(cache_key)
+    if cached is not None and cached[0] == time_bucket:
+        return dict(cached[1])
+
     # Format symbols exchange:symbol
-    symbols = [f"{exchange.upper()}:{symbol}" for symbol in coins]
+    prefix = f"{exchange.upper()}:"
+    symbols = [f"{prefix}{symbol}" for symbol in coins]
 
-    analysis = get_multiple_analysis(
-        symbols=symbols, interval=time_frame, screener="crypto"
-    )
+    analysis = asyncio.run(fetch_RSI(symbols, time_frame))
 
     # For each symbol get the RSI
-    rsi_dict = {}
-    for symbol in symbols:
-        if analysis[symbol] is None:
-            # print(f"No analysis for {symbol}")
-            continue
-        clean_symbol = symbol.replace(f"{exchange.upper()}:", "")
-        clean_symbol = clean_symbol.replace("USDT", "")
-        rsi_dict[clean_symbol] = analysis[symbol].indicators["RSI"]
+    rsi_dict = {
+        symbol[len(prefix) :].replace("USDT", ""): analysis[symbol]
+        for symbol in symbols
+        if analysis.get(symbol) is not None
+    }
 
     # Save the RSI data to a CSV file
     save_RSI(rsi_dict, time_frame)
+    _rsi_cache[cache_key] = (time_bucket, rsi_dict)
+
+    return dict(rsi_dict)
+
 
-    return rsi_dict
+async def fetch_RSI(symbols: list, time_frame: str) -> dict:
+    column = f"RSI{INTERVAL_SUFFIXES[time_frame]}"
+    batches = [
+        symbols[i : i + BATCH_SIZE] for i in range(0, len(symbols), BATCH_SIZE)
+    ]
+
+    async with httpx.AsyncClient(http2=True) as client:
+        responses = await asyncio.gather(
+            *[
+                client.post(
+                    SCAN_URL,
+                    json={
+                        "symbols": {"tickers": batch, "query": {"types": []}},
+                        "columns": [column],
+                    },
+                )
+                for batch in batches
+            ]
+        )
+
+    # Symbols unknown to TradingView are left out of the response
+    analysis = {}
+    for response in responses:
+        response.raise_for_status()
+        analysis.update({row["s"]: row["d"][0] for row in response.json()["data"]})
+
+    return analysis
 
 
 def get_closest_to_24h(
@@ -88,23 +165,16 @@ def save_RSI(
 
 
 def get_top_vol_coins(length: int = 100) -> list:
+    # The time bucket expires the in-memory cache every TOP_VOL_CACHE_SECONDS
+    time_bucket = int(time.time() // TOP_VOL_CACHE_SECONDS)
+    return list(_get_top_vol_coins(length, time_bucket))
+
+
+@lru_cache(maxsize=8)
+def _get_top_vol_coins(length: int, time_bucket: int) -> tuple:
 
     CACHE_FILE = "data/top_vol_coins_cache.pkl"
     CACHE_EXPIRATION = 24 * 60 * 60  # 24 hours in seconds
-    # List of symbols to exclude
-    STABLE_COINS = [
-        "OKBUSDT",
-        "DAIUSDT",
-        "USDTUSDT",
-        "USDCUSDT",
-        "BUSDUSDT",
-        "TUSDUSDT",
-        "PAXUSDT",
-        "EURUSDT",
-        "GBPUSDT",
-        "CETHUSDT",
-        "WBTCUSDT",
-    ]
 
     # Check if the cache file exists and is not expired
     os.makedirs(CACHE_FILE.split("/")[0], exist_ok=True)
@@ -115,16 +185,14 @@ def get_top_vol_coins(length: int = 100) -> list:
             if time.time() - cache_time < CACHE_EXPIRATION:
                 # Return the cached data if it's not expired
                 print("Using cached top volume coins")
-                return cache_data["data"][:length]
+                return tuple(cache_data["data"][:length])
 
     # Fetch fresh data if the cache is missing or expired
-    df = pd.DataFrame(cg.get_coins_markets("usd"))["symbol"].str.upper() + "USDT"
-
-    sorted_volume = df[~df.isin(STABLE_COINS)]
-    top_vol_coins = sorted_volume.tolist()
+    symbols = (f"{coin['symbol'].upper()}USDT" for coin in cg.get_coins_markets("usd"))
+    top_vol_coins = [symbol for symbol in symbols if symbol not in _STABLE_COINS]
 
     # Save the result to the cache
     with open(CACHE_FILE, "wb") as f:
         pickle.dump({"timestamp": time.time(), "data": top_vol_coins}, f)
 
-    return top_vol_coins[:length]
+    return tuple(top_vol_coins[:length])
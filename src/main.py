@@ -1,10 +1,23 @@
+import matplotlib
 import matplotlib.pyplot as plt
 import numpy as np
-from matplotlib.widgets import CheckButtons
+from matplotlib.collections import LineCollection
+from matplotlib.transforms import Bbox
+from matplotlib.widgets import RadioButtons
 
 from data import get_closest_to_24h, get_RSI, get_top_vol_coins
 
+# Let the Agg renderer simplify and chunk paths
+matplotlib.rcParams.update(
+    {
+        "path.simplify": True,
+        "path.simplify_threshold": 1.0,
+        "agg.path.chunksize": 10000,
+    }
+)
+
 FIGURE_SIZE = (14, 12)
+FIGURE_DPI = 100
 BACKGROUND_COLOR = "#0d1117"
 RANGES = {
     "Overbought": (70, 100),
@@ -30,108 +43,194 @@ SCATTER_COLORS = {
 
 TIMEFRAMES = ["5m", "15m", "1h", "4h", "1d"]
 
+# Whether the figure window has been moved to the top left corner
+_WINDOW_PLACED = False
 
-def get_color_for_rsi(rsi_value: float) -> dict:
-    for label, (low, high) in RANGES.items():
-        if low <= rsi_value < high:
-            return SCATTER_COLORS[label]
-    return None
+# (start, end, color, label) of each RSI band
+_COLOR_MAP = tuple((*RANGES[k], COLORS_LABELS[k], k) for k in RANGES)
 
+# Band label heights, the outer bands are labelled near the visible y-limits
+_BAND_LABEL_Y = tuple(
+    start + 5 if i == 0 else end - 5 if i == len(_COLOR_MAP) - 1 else (start + end) / 2
+    for i, (start, end, _, _) in enumerate(_COLOR_MAP)
+)
+# Labels are placed in axes coordinates horizontally, independent of the xlim
+LABEL_X = 0.995
 
-def plot_rsi_heatmap(num_coins: int = 100, time_frame: str = "1h"):
-    fig, ax = plt.subplots(figsize=FIGURE_SIZE)
-    plt.subplots_adjust(left=0.05, bottom=0.2, right=0.95, top=0.9)
+# Legend colors, with the neutral band made visible on the dark background
+_LEGEND_COLORS = [
+    "#808080" if label == "Neutral" else color for label, color in COLORS_LABELS.items()
+]
+_LEGEND_HANDLES = [
+    plt.Line2D(
+        [0],
+        [0],
+        marker="s",
+        color=BACKGROUND_COLOR,
+        markerfacecolor=color,
+        markersize=10,
+        label=label.upper(),
+    )
+    for color, label in zip(_LEGEND_COLORS, COLORS_LABELS.keys())
+]
 
-    # Set the background color
-    fig.patch.set_facecolor(BACKGROUND_COLOR)
-    ax.set_facecolor(BACKGROUND_COLOR)
+# Bucket edges between the RSI ranges, with one color per bucket (low to high)
+_BIN_EDGES = np.array([30.0, 40.0, 60.0, 70.0])
+_BUCKET_COLORS = np.array(list(SCATTER_COLORS.values()))
+# Reused by get_colors_for_rsi, the number of coins is the same for every timeframe
+_color_buf = np.empty(0, dtype=_BUCKET_COLORS.dtype)
 
-    # Fetch and process data
-    top_vol = get_top_vol_coins(num_coins)
-    rsi_data = get_RSI(top_vol, time_frame=time_frame)
+
+def get_color_for_rsi(rsi_value: float) -> str:
+    idx = np.searchsorted(_BIN_EDGES, rsi_value, side="right")
+    return _BUCKET_COLORS[idx]
+
+
+def get_colors_for_rsi(rsi_values: np.ndarray) -> np.ndarray:
+    # The result is written to a shared buffer, so it is only valid until the
+    # next call (matplotlib copies colors into its own RGBA array). searchsorted
+    # over the edges only returns 0..4, so mode="clip" is safe and lets np.take
+    # write into the buffer directly instead of through a temporary copy
+    global _color_buf
+    idx = np.searchsorted(_BIN_EDGES, rsi_values, side="right")
+    if _color_buf.shape != idx.shape:
+        _color_buf = np.empty(idx.shape, dtype=_BUCKET_COLORS.dtype)
+    return np.take(_BUCKET_COLORS, idx, out=_color_buf, mode="clip")
+
+
+def get_rsi_arrays(coins: list, time_frame: str) -> tuple:
+    rsi_data = get_RSI(coins, time_frame=time_frame)
     old_rsi_data = get_closest_to_24h(time_frame=time_frame)
 
     rsi_symbols = list(rsi_data.keys())
-    rsi_values = list(rsi_data.values())
-    average_rsi = np.mean(rsi_values)
+    rsi_values = np.array(list(rsi_data.values()))
+    # Symbols without a value from ~24h ago get NaN
+    old_values = np.array([old_rsi_data.get(symbol, np.nan) for symbol in rsi_symbols])
 
-    # Define color ranges for RSI
-    color_map = []
-    for k in RANGES:
-        color_map.append((*RANGES[k], COLORS_LABELS[k], k))
+    return rsi_symbols, rsi_values, old_values
 
-    # Dropdown for timeframe selection
-    rax = plt.axes([0.1, 0.05, 0.8, 0.075], facecolor="white")  # Adjust size and position
-    dropdown = CheckButtons(rax, TIMEFRAMES, [tf == time_frame for tf in TIMEFRAMES])
 
-    def update_plot(label):
-        selected_timeframes = [
-            tf for tf, state in zip(TIMEFRAMES, dropdown.get_status()) if state
-        ]
-        if selected_timeframes:  # If at least one timeframe is selected
-            plt.close('all')  # Clear the figure
-            plot_rsi_heatmap(num_coins, label)  # Re-plot with new timeframe
+def get_diff_segments(
+    xs: np.ndarray, rsi_values: np.ndarray, old_values: np.ndarray
+) -> tuple:
+    has_old = ~np.isnan(old_values)
+    segments = np.stack(
+        [np.column_stack([xs, old_values]), np.column_stack([xs, rsi_values])], axis=1
+    )[has_old]
+    diffs = rsi_values[has_old] - old_values[has_old]
+    line_colors = np.where(diffs > 0, "#1f9986", "#e23343")
 
-    dropdown.on_clicked(update_plot)
+    return segments, line_colors
 
-    # RSI ranges as background bands
-    for i, (start, end, color, symbol) in enumerate(color_map):
-        ax.fill_between([0, len(rsi_symbols) + 2], start, end, color=color, alpha=0.35)
 
-        y_pos = (start + end) / 2 if i not in (0, len(color_map) - 1) else (
-            start + 5 if i == 0 else end - 5
+def annotate_symbols(ax: plt.Axes, xs: np.ndarray, ys: np.ndarray, symbols: list):
+    return [
+        ax.annotate(
+            symbol,
+            (x, y),
+            color="#b9babc",
+            textcoords="offset points",
+            xytext=(0, 10),
+            ha="center",
+            animated=True,
         )
+        for x, y, symbol in zip(xs, ys, symbols)
+    ]
+
+
+def update_annotations(
+    ax: plt.Axes, annotations: list, xs: np.ndarray, ys: np.ndarray, symbols: list
+) -> list:
+    # Move the existing labels instead of creating new artists
+    for annotation, x, y, symbol in zip(annotations, xs, ys, symbols):
+        annotation.xy = (x, y)
+        annotation.set_text(symbol)
+
+    # Only add or remove labels if the number of symbols changed
+    n = len(annotations)
+    for annotation in annotations[len(symbols) :]:
+        annotation.remove()
+
+    return annotations[: len(symbols)] + annotate_symbols(
+        ax, xs[n:], ys[n:], symbols[n:]
+    )
+
+
+def plot_rsi_heatmap(num_coins: int = 100, time_frame: str = "1h") -> dict:
+    fig, ax = plt.subplots(figsize=FIGURE_SIZE, dpi=FIGURE_DPI)
+    plt.subplots_adjust(left=0.05, bottom=0.2, right=0.95, top=0.9)
+
+    # Set the background color
+    fig.patch.set_facecolor(BACKGROUND_COLOR)
+    ax.set_facecolor(BACKGROUND_COLOR)
+
+    # Fetch and process data
+    top_vol = get_top_vol_coins(num_coins)
+    rsi_symbols, rsi_values, old_values = get_rsi_arrays(top_vol, time_frame)
+    average_rsi = np.mean(rsi_values)
+
+    # Dropdown for timeframe selection
+    # RGBA facecolor avoids needless widget redraws on mouse motion
+    rax = plt.axes([0.1, 0.05, 0.8, 0.075], facecolor=(1.0, 1.0, 1.0, 1.0))
+    dropdown = RadioButtons(
+        rax,
+        TIMEFRAMES,
+        active=TIMEFRAMES.index(time_frame),
+        activecolor=(0.0, 0.0, 1.0, 1.0),
+        useblit=True,
+    )
 
+    # RSI ranges as background bands
+    for (start, end, color, symbol), y_pos in zip(_COLOR_MAP, _BAND_LABEL_Y):
+        ax.axhspan(start, end, facecolor=color, alpha=0.35, zorder=-1)
         ax.text(
-            len(rsi_symbols) + 1.5,
+            LABEL_X,
             y_pos,
             symbol.upper(),
+            transform=ax.get_yaxis_transform(),
             va="center",
             ha="right",
             fontsize=15,
             color="grey",
         )
 
-    # Plot each RSI point
-    for i, symbol in enumerate(rsi_symbols):
-        ax.scatter(
-            i + 1,
-            rsi_values[i],
-            color=get_color_for_rsi(rsi_values[i]),
-            s=100,
-        )
-        ax.annotate(
-            symbol,
-            (i + 1, rsi_values[i]),
-            color="#b9babc",
-            textcoords="offset points",
-            xytext=(0, 10),
-            ha="center",
-        )
-        # Line connecting old and new RSI values
-        if symbol in old_rsi_data:
-            rsi_diff = rsi_values[i] - old_rsi_data[symbol]
-            line_color = "#1f9986" if rsi_diff > 0 else "#e23343"
-            ax.plot(
-                [i + 1, i + 1],
-                [old_rsi_data[symbol], rsi_values[i]],
-                color=line_color,
-                linestyle="--",
-                linewidth=0.75,
-            )
+    # Everything below depends on the timeframe, so it is drawn with blitting
+    # on top of a cached background instead of being part of the static figure
+
+    # Plot all RSI points as a single collection
+    xs = np.arange(1, len(rsi_symbols) + 1)
+    scatter = ax.scatter(
+        xs, rsi_values, c=get_colors_for_rsi(rsi_values), s=100, animated=True
+    )
+    annotations = annotate_symbols(ax, xs, rsi_values, rsi_symbols)
+
+    # Lines connecting old and new RSI values
+    segments, line_colors = get_diff_segments(xs, rsi_values, old_values)
+    diff_lines = LineCollection(
+        segments, colors=line_colors, linestyles="--", linewidths=0.75, animated=True
+    )
+    ax.add_collection(diff_lines, autolim=False)
 
     # Average RSI line
-    ax.axhline(
-        xmin=0, xmax=1, y=average_rsi, color="#d58c3c", linestyle="--", linewidth=0.75
+    avg_line = ax.axhline(
+        xmin=0,
+        xmax=1,
+        y=average_rsi,
+        color="#d58c3c",
+        linestyle="--",
+        linewidth=0.75,
+        animated=True,
     )
-    ax.text(
-        len(rsi_symbols) + 1.5,
+    avg_text = ax.text(
+        LABEL_X,
         average_rsi,
         f"AVG RSI: {average_rsi:.2f}",
+        transform=ax.get_yaxis_transform(),
         color="#d58c3c",
         va="bottom",
         ha="right",
         fontsize=15,
+        animated=True,
     )
 
     # Axis styling
@@ -139,6 +238,8 @@ def plot_rsi_heatmap(num_coins: int = 100, time_frame: str = "1h"):
     ax.set_ylim(20, 80)
     ax.set_xlim(0, len(rsi_symbols) + 2)
     ax.set_xticks([])
+    # Rasterize the background bands (zorder < 0) when saving as a vector image
+    ax.set_rasterization_zorder(0)
 
     # Add legend
     add_legend(ax)
@@ -148,7 +249,7 @@ def plot_rsi_heatmap(num_coins: int = 100, time_frame: str = "1h"):
         spine.set_edgecolor(BACKGROUND_COLOR)
 
     # Add title
-    plt.text(
+    title = ax.text(
         -0.025,
         1.125,
         f"Crypto Market RSI Heatmap ({time_frame})",
@@ -158,37 +259,111 @@ def plot_rsi_heatmap(num_coins: int = 100, time_frame: str = "1h"):
         horizontalalignment="left",
         color="white",
         weight="bold",
+        animated=True,
     )
 
-    manager = plt.get_current_fig_manager()
-    manager.window.wm_geometry("+0+0")
-    plt.show()
+    # Timeframe dependent artists, plus the cached background they are blitted on
+    artists = {
+        "scatter": scatter,
+        "diff_lines": diff_lines,
+        "avg_line": avg_line,
+        "avg_text": avg_text,
+        "title": title,
+        "annotations": annotations,
+        "dropdown": dropdown,
+        "blit_bbox": None,
+        "background": None,
+    }
 
+    canvas = fig.canvas
 
-def add_legend(ax: plt.Axes) -> None:
-    adjusted_colors = list(COLORS_LABELS.values())
-    adjusted_colors[2] = "#808080"
-    legend_handles = [
-        plt.Line2D(
-            [0],
-            [0],
-            marker="s",
-            color=BACKGROUND_COLOR,
-            markerfacecolor=color,
-            markersize=10,
-            label=label,
-        )
-        for color, label in zip(
-            adjusted_colors,
-            [label.upper() for label in list(COLORS_LABELS.keys())],
+    def on_draw(event):
+        # Saving draws the animated artists into the frame (and may switch to a
+        # vector canvas), which must not become the blit background
+        if event.canvas is not canvas or canvas.is_saving():
+            return
+
+        # Without blitting the animated artists are drawn on top of every draw
+        if not canvas.supports_blit:
+            draw_animated(artists)
+            return
+
+        # Only the plot area is blitted, the dropdown handles its own redraws
+        artists["blit_bbox"] = Bbox.from_extents(
+            fig.bbox.x0, ax.bbox.y0, fig.bbox.x1, fig.bbox.y1
         )
-    ]
+        artists["background"] = fig.canvas.copy_from_bbox(artists["blit_bbox"])
+        draw_animated(artists)
 
+    fig.canvas.mpl_connect("draw_event", on_draw)
+
+    def update_plot(label):
+        refresh(ax, top_vol, label, artists)
+
+    dropdown.on_clicked(update_plot)
+
+    # Only move the window once, later figures keep wherever the user put it
+    global _WINDOW_PLACED
+    if not _WINDOW_PLACED:
+        manager = plt.get_current_fig_manager()
+        manager.window.wm_geometry("+0+0")
+        _WINDOW_PLACED = True
+
+    return artists
+
+
+def draw_animated(artists: dict) -> None:
+    fig = artists["scatter"].figure
+    for name in ("scatter", "diff_lines", "avg_line", "avg_text", "title"):
+        fig.draw_artist(artists[name])
+    for annotation in artists["annotations"]:
+        fig.draw_artist(annotation)
+
+
+def refresh(ax: plt.Axes, coins: list, time_frame: str, artists: dict) -> None:
+    rsi_symbols, rsi_values, old_values = get_rsi_arrays(coins, time_frame)
+    average_rsi = np.mean(rsi_values)
+    xs = np.arange(1, len(rsi_symbols) + 1)
+
+    artists["scatter"].set_offsets(np.column_stack([xs, rsi_values]))
+    artists["scatter"].set_color(get_colors_for_rsi(rsi_values))
+
+    segments, line_colors = get_diff_segments(xs, rsi_values, old_values)
+    artists["diff_lines"].set_segments(segments)
+    artists["diff_lines"].set_color(line_colors)
+
+    artists["annotations"] = update_annotations(
+        ax, artists["annotations"], xs, rsi_values, rsi_symbols
+    )
+
+    artists["avg_line"].set_ydata([average_rsi, average_rsi])
+    artists["avg_text"].set_y(average_rsi)
+    artists["avg_text"].set_text(f"AVG RSI: {average_rsi:.2f}")
+    artists["title"].set_text(f"Crypto Market RSI Heatmap ({time_frame})")
+
+    # A different number of symbols needs new limits, so the cached background
+    # is stale and the figure has to be redrawn in full
+    xlim_changed = ax.get_xlim()[1] != len(rsi_symbols) + 2
+    if xlim_changed:
+        ax.set_xlim(0, len(rsi_symbols) + 2)
+
+    canvas = ax.figure.canvas
+    if xlim_changed or not canvas.supports_blit or artists["background"] is None:
+        # Coalesce into a single full redraw on the next event loop iteration
+        canvas.draw_idle()
+        return
+
+    canvas.restore_region(artists["background"])
+    draw_animated(artists)
+    canvas.blit(artists["blit_bbox"])
+
+
+def add_legend(ax: plt.Axes) -> None:
     legend = ax.legend(
-        handles=legend_handles,
+        handles=_LEGEND_HANDLES,
         loc="upper center",
         bbox_to_anchor=(0.5, 1.05),
-        ncol=len(legend_handles),
+        ncol=len(_LEGEND_HANDLES),
         frameon=False,
         fontsize="small",
         labelcolor="white",
@@ -199,4 +374,5 @@ def add_legend(ax: plt.Axes) -> None:
 
 
 if __name__ == "__main__":
-    plot_rsi_heatmap(num_coins=100)
+    artists = plot_rsi_heatmap(num_coins=100)
+    plt.show()